@@ -1,4 +1,5 @@
 import os
+import threading
 
 import torch
 from loguru import logger
@@ -67,6 +68,7 @@ def ocr_model_init(det_db_box_thresh=0.3,
 class AtomModelSingleton:
     _instance = None
     _models = {}
+    _lock = threading.RLock()
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -85,8 +87,10 @@ class AtomModelSingleton:
         else:
             key = atom_model_name
 
-        if key not in self._models:
-            self._models[key] = atom_model_init(model_name=atom_model_name, **kwargs)
+        # table模型初始化时会重入获取ocr模型，因此使用可重入锁
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = atom_model_init(model_name=atom_model_name, **kwargs)
         return self._models[key]
 
 def atom_model_init(model_name: str, **kwargs):
@@ -1,4 +1,5 @@
 import os
+import threading
 import time
 from typing import List, Tuple
 import PIL.Image
@@ -8,7 +9,7 @@ from .model_init import MineruPipelineModel
 from mineru.utils.config_reader import get_device
 from ...utils.pdf_classify import classify
 from ...utils.pdf_image_tools import load_images_from_pdf
-from ...utils.model_utils import get_vram, clean_memory
+from ...utils.model_utils import get_vram, clean_memory, clean_vram
 
 
 os.environ['PYTORCH_ENABLE_MPS_FALLBACK'] = '1'  # 让mps可以fallback
@@ -17,6 +18,7 @@ os.environ['NO_ALBUMENTATIONS_UPDATE'] = '1'  # 禁止albumentations检查更新
 class ModelSingleton:
     _instance = None
     _models = {}
+    _lock = threading.RLock()
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -30,12 +32,14 @@ class ModelSingleton:
         table_enable=None,
     ):
         key = (lang, formula_enable, table_enable)
-        if key not in self._models:
-            self._models[key] = custom_model_init(
-                lang=lang,
-                formula_enable=formula_enable,
-                table_enable=table_enable,
-            )
+        # 多个请求线程并发时避免同一组模型被重复加载
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = custom_model_init(
+                    lang=lang,
+                    formula_enable=formula_enable,
+                    table_enable=table_enable,
+                )
         return self._models[key]
 
 
@@ -116,7 +120,9 @@ def doc_analyze(
         for i in range(0, len(images_with_extra_info), batch_size)
     ]
 
-    # 执行批处理
+    # 执行批处理，设备检测与批处理模型只初始化一次，所有批次共用
+    device = get_device()
+    batch_model = init_batch_model(device, formula_enable, table_enable)
     results = []
     processed_images_count = 0
     for index, batch_image in enumerate(batch_images):
@@ -125,8 +131,11 @@ def doc_analyze(
             f'Batch {index + 1}/{len(batch_images)}: '
             f'{processed_images_count} pages/{len(images_with_extra_info)} pages'
         )
-        batch_results = batch_image_analyze(batch_image, formula_enable, table_enable)
+        batch_results = batch_model(batch_image)
         results.extend(batch_results)
+        # 小显存设备在批次之间释放缓存，其余设备在全部批次结束后统一清理
+        clean_vram(device)
+    clean_memory(device)
 
     # 构建返回结果
     infer_results = []
@@ -152,12 +161,22 @@ def batch_image_analyze(
         table_enable=True):
     # os.environ['CUDA_VISIBLE_DEVICES'] = str(idx)
 
+    device = get_device()
+    batch_model = init_batch_model(device, formula_enable, table_enable)
+    results = batch_model(images_with_extra_info)
+
+    clean_memory(device)
+
+    return results
+
+
+def init_batch_model(device, formula_enable=True, table_enable=True):
+
     from .batch_analyze import BatchAnalyze
 
     model_manager = ModelSingleton()
 
     batch_ratio = 1
-    device = get_device()
 
     if str(device).startswith('npu'):
         try:
@@ -190,9 +209,4 @@ def batch_image_analyze(
             batch_ratio = 1
             logger.info(f'Could not determine GPU memory, using default batch_ratio: {batch_ratio}')
 
-    batch_model = BatchAnalyze(model_manager, batch_ratio, formula_enable, table_enable)
-    results = batch_model(images_with_extra_info)
-
-    clean_memory(get_device())
-
-    return results
\ No newline at end of file
+    return BatchAnalyze(model_manager, batch_ratio, formula_enable, table_enable)
@@ -1,4 +1,5 @@
 # Copyright (c) Opendatalab. All rights reserved.
+import threading
 import time
 
 from loguru import logger
@@ -14,6 +15,7 @@ from ...utils.models_download_utils import auto_download_and_get_model_root_path
 class ModelSingleton:
     _instance = None
     _models = {}
+    _lock = threading.RLock()
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -27,14 +29,16 @@ class ModelSingleton:
         server_url: str | None,
     ) -> BasePredictor:
         key = (backend, model_path, server_url)
-        if key not in self._models:
-            if backend in ['transformers', 'sglang-engine'] and not model_path:
-                model_path = auto_download_and_get_model_root_path("/","vlm")
-            self._models[key] = get_predictor(
-                backend=backend,
-                model_path=model_path,
-                server_url=server_url,
-            )
+        # 多个请求线程并发时避免同一个predictor被重复加载
+        with self._lock:
+            if key not in self._models:
+                if backend in ['transformers', 'sglang-engine'] and not model_path:
+                    model_path = auto_download_and_get_model_root_path("/","vlm")
+                self._models[key] = get_predictor(
+                    backend=backend,
+                    model_path=model_path,
+                    server_url=server_url,
+                )
         return self._models[key]
 
 
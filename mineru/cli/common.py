@@ -51,6 +51,11 @@ def convert_pdf_bytes_to_bytes_by_pypdfium2(pdf_bytes, start_page_id=0, end_page
         logger.warning("end_page_id is out of range, use pdf_docs length")
         end_page_id = len(pdf) - 1
 
+    # 页码范围覆盖整个文档时无需重新生成PDF，直接复用原始字节
+    if start_page_id == 0 and end_page_id == len(pdf) - 1:
+        pdf.close()
+        return pdf_bytes
+
     # 创建一个新的PDF文档
     output_pdf = pdfium.PdfDocument.new()
 
@@ -108,7 +113,8 @@ def do_parse(
         infer_results, all_image_lists, all_pdf_docs, lang_list, ocr_enabled_list = pipeline_doc_analyze(pdf_bytes_list, p_lang_list, parse_method=parse_method, formula_enable=p_formula_enable,table_enable=p_table_enable)
 
         for idx, model_list in enumerate(infer_results):
-            model_json = copy.deepcopy(model_list)
+            # model_list会在生成middle_json时被修改，仅在需要输出时保留一份原始副本
+            model_json = copy.deepcopy(model_list) if f_dump_model_output else None
             pdf_file_name = pdf_file_names[idx]
             local_image_dir, local_md_dir = prepare_env(output_dir, pdf_file_name, parse_method)
             image_writer, md_writer = FileBasedDataWriter(local_image_dir), FileBasedDataWriter(local_md_dir)
@@ -43,6 +43,8 @@ class FileBasedDataWriter(DataWriter):
             parent_dir (str, optional): the parent directory that may be used within methods. Defaults to ''.
         """
         self._parent_dir = parent_dir
+        # 已确认存在的目录，同一个writer多次写入时无需重复检查和创建
+        self._known_dirs = set()
 
     def write(self, path: str, data: bytes) -> None:
         """Write file with data.
@@ -55,8 +57,18 @@ class FileBasedDataWriter(DataWriter):
         if not os.path.isabs(fn_path) and len(self._parent_dir) > 0:
             fn_path = os.path.join(self._parent_dir, path)
 
-        if not os.path.exists(os.path.dirname(fn_path)) and os.path.dirname(fn_path) != "":
-            os.makedirs(os.path.dirname(fn_path), exist_ok=True)
+        dir_path = os.path.dirname(fn_path)
+        if dir_path != "" and dir_path not in self._known_dirs:
+            os.makedirs(dir_path, exist_ok=True)
+            self._known_dirs.add(dir_path)
 
-        with open(fn_path, 'wb') as f:
+        try:
+            f = open(fn_path, 'wb')
+        except FileNotFoundError:
+            if dir_path == "":
+                raise
+            # 缓存的目录在两次写入之间被删除，重新创建
+            os.makedirs(dir_path, exist_ok=True)
+            f = open(fn_path, 'wb')
+        with f:
             f.write(data)
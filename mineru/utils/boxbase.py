@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 
 def is_in(box1, box2) -> bool:
     """box1是否完全在box2里面."""
@@ -168,6 +170,35 @@ def calculate_overlap_area_in_bbox1_area_ratio(bbox1, bbox2):
         return intersection_area / bbox1_area
 
 
+def calculate_overlap_area_in_bbox1_area_ratio_matrix(bboxes1, bboxes2):
+    """批量计算bboxes1中每个box与bboxes2中每个box的重叠面积占bboxes1中box面积的比例.
+
+    与calculate_overlap_area_in_bbox1_area_ratio逐对计算的结果一致，
+    用numpy一次算出N×M的比例矩阵，避免python层面的双重循环。
+
+    Args:
+        bboxes1 (list): N个边界框，格式为 [x1, y1, x2, y2]
+        bboxes2 (list): M个边界框，格式与 `bboxes1` 相同
+
+    Returns:
+        np.ndarray: 形状为(N, M)的比例矩阵
+    """
+    bboxes1 = np.asarray(bboxes1, dtype=np.float64).reshape(-1, 4)
+    bboxes2 = np.asarray(bboxes2, dtype=np.float64).reshape(-1, 4)
+
+    x_left = np.maximum(bboxes1[:, None, 0], bboxes2[None, :, 0])
+    y_top = np.maximum(bboxes1[:, None, 1], bboxes2[None, :, 1])
+    x_right = np.minimum(bboxes1[:, None, 2], bboxes2[None, :, 2])
+    y_bottom = np.minimum(bboxes1[:, None, 3], bboxes2[None, :, 3])
+
+    intersection_area = np.clip(x_right - x_left, 0, None) * np.clip(y_bottom - y_top, 0, None)
+    bbox1_area = ((bboxes1[:, 2] - bboxes1[:, 0]) * (bboxes1[:, 3] - bboxes1[:, 1]))[:, None]
+
+    ratio = np.zeros(intersection_area.shape, dtype=np.float64)
+    np.divide(intersection_area, bbox1_area, out=ratio, where=bbox1_area != 0)
+    return ratio
+
+
 def calculate_vertical_projection_overlap_ratio(block1, block2):
     """
     Calculate the proportion of the x-axis covered by the vertical projection of two blocks.
@@ -1,4 +1,12 @@
 # Copyright (c) Opendatalab. All rights reserved.
+import base64
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
 
 import pypdfium2 as pdfium
@@ -9,6 +17,13 @@ from mineru.data.data_reader_writer import FileBasedDataWriter
 from mineru.utils.pdf_reader import image_to_b64str, image_to_bytes, page_to_image
 from .hash_utils import str_sha256
 
+# 每个渲染任务包含的页数
+RENDER_CHUNK_PAGES = 4
+
+# 渲染进程池在多次调用间复用
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
 
 def pdf_page_to_image(page: pdfium.PdfPage, dpi=200) -> dict:
     """Convert pdfium.PdfDocument to image, Then convert the image to base64.
@@ -31,13 +46,102 @@ def pdf_page_to_image(page: pdfium.PdfPage, dpi=200) -> dict:
     return image_dict
 
 
+def _render_pages_worker(pdf_path, dpi, start_page_id, end_page_id):
+    """在子进程中渲染[start_page_id, end_page_id]范围内的页面.
+
+    pdfium非线程安全，每个任务按路径各自打开文档；返回PNG字节而不是PIL对象和base64字符串，
+    减少进程间传输的数据量。
+    """
+    pdf_doc = pdfium.PdfDocument(pdf_path)
+    try:
+        results = []
+        for index in range(start_page_id, end_page_id + 1):
+            pil_img, scale = page_to_image(pdf_doc[index], dpi=dpi)
+            results.append((image_to_bytes(pil_img, image_format="PNG"), scale))
+        return results
+    finally:
+        pdf_doc.close()
+
+
+def _png_bytes_to_image_dict(png_bytes, scale) -> dict:
+    # 与pdf_page_to_image结果一致：PNG无损，base64即为同一份PNG编码
+    pil_img = Image.open(BytesIO(png_bytes))
+    pil_img.load()
+    return {
+        "img_base64": base64.b64encode(png_bytes).decode("utf-8"),
+        "img_pil": pil_img,
+        "scale": scale,
+    }
+
+
+def _get_render_pool(processes):
+    global _render_pool
+    with _render_pool_lock:
+        # 进程池只创建一次，各调用方通过在途任务数控制自己的并行度，不会因页数不同而重建
+        if _render_pool is None:
+            # 调用方进程通常已持有torch/CUDA状态和服务线程，使用spawn避免fork
+            _render_pool = ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _render_pool
+
+
+def _discard_broken_render_pool(pool):
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is pool:
+            _render_pool = None
+    # 池已损坏，其上的任务均已失败，这里只释放资源，不取消其他调用方的任务
+    pool.shutdown(wait=False)
+
+
+def _load_images_by_render_pool(pdf_bytes, dpi, start_page_id, end_page_id, processes, pool_processes):
+    # 文档只落盘一次，子进程按路径打开，避免每个任务都序列化整份pdf_bytes
+    fd, pdf_path = tempfile.mkstemp(suffix=".pdf")
+    executor = None
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+
+        executor = _get_render_pool(pool_processes)
+        # 按小块提交，并限制本次调用同时在途的任务数，按页码顺序取回结果
+        max_in_flight = processes * 2
+        pending = deque()
+        images_list = []
+        for range_start in range(start_page_id, end_page_id + 1, RENDER_CHUNK_PAGES):
+            range_end = min(range_start + RENDER_CHUNK_PAGES - 1, end_page_id)
+            if len(pending) >= max_in_flight:
+                images_list.extend(
+                    _png_bytes_to_image_dict(png_bytes, scale) for png_bytes, scale in pending.popleft().result()
+                )
+            pending.append(executor.submit(_render_pages_worker, pdf_path, dpi, range_start, range_end))
+        while pending:
+            images_list.extend(
+                _png_bytes_to_image_dict(png_bytes, scale) for png_bytes, scale in pending.popleft().result()
+            )
+        return images_list
+    except BrokenProcessPool:
+        if executor is not None:
+            _discard_broken_render_pool(executor)
+        raise
+    finally:
+        try:
+            os.remove(pdf_path)
+        except OSError:
+            pass
+
+
 def load_images_from_pdf(
     pdf_bytes: bytes,
     dpi=200,
     start_page_id=0,
     end_page_id=None,
+    processes=None,
 ):
-    images_list = []
+    """
+    默认在当前进程中顺序渲染。可通过参数processes或环境变量MINERU_PDF_RENDER_PROCESSES
+    开启多进程渲染，子进程使用spawn方式启动，调用方脚本需要有 if __name__ == "__main__" 保护。
+    """
     pdf_doc = pdfium.PdfDocument(pdf_bytes)
     pdf_page_num = len(pdf_doc)
     end_page_id = end_page_id if end_page_id is not None and end_page_id >= 0 else pdf_page_num - 1
@@ -45,11 +149,26 @@ def load_images_from_pdf(
         logger.warning("end_page_id is out of range, use images length")
         end_page_id = pdf_page_num - 1
 
-    for index in range(0, pdf_page_num):
-        if start_page_id <= index <= end_page_id:
-            page = pdf_doc[index]
-            image_dict = pdf_page_to_image(page, dpi=dpi)
-            images_list.append(image_dict)
+    page_count = end_page_id - start_page_id + 1
+    if processes is None:
+        processes = int(os.getenv('MINERU_PDF_RENDER_PROCESSES', 1))
+    # 页数不足两个任务块时，进程间传输的开销大于并行收益
+    call_processes = min(processes, page_count // RENDER_CHUNK_PAGES)
+
+    if call_processes > 1:
+        try:
+            images_list = _load_images_by_render_pool(
+                pdf_bytes, dpi, start_page_id, end_page_id, call_processes, processes
+            )
+            return images_list, pdf_doc
+        except BrokenProcessPool as e:
+            logger.warning(f"render process pool broken, fallback to rendering in current process: {e}")
+
+    images_list = []
+    for index in range(start_page_id, end_page_id + 1):
+        page = pdf_doc[index]
+        image_dict = pdf_page_to_image(page, dpi=dpi)
+        images_list.append(image_dict)
 
     return images_list, pdf_doc
 
@@ -7,7 +7,7 @@ import numpy as np
 from loguru import logger
 
 from mineru.utils.boxbase import calculate_overlap_area_in_bbox1_area_ratio, calculate_iou, \
-    get_minbox_if_overlap_by_ratio
+    get_minbox_if_overlap_by_ratio, calculate_overlap_area_in_bbox1_area_ratio_matrix
 from mineru.utils.enum_class import BlockType, ContentType
 from mineru.utils.pdf_image_tools import get_crop_img
 from mineru.utils.pdf_text_tool import get_page
@@ -28,28 +28,38 @@ def remove_outside_spans(spans, all_bboxes, all_discarded_blocks):
     other_block_bboxes = get_block_bboxes(all_bboxes, other_block_type)
     discarded_block_bboxes = get_block_bboxes(all_discarded_blocks, [BlockType.DISCARDED])
 
+    if len(spans) == 0:
+        return []
+
+    # 一次性算出所有span与各类block的重叠比例矩阵，再按行判断是否存在满足阈值的block
+    span_bboxes = [span['bbox'] for span in spans]
+
+    def overlap_any(block_bboxes, threshold):
+        ratio_matrix = calculate_overlap_area_in_bbox1_area_ratio_matrix(span_bboxes, block_bboxes)
+        return (ratio_matrix > threshold).any(axis=1)
+
+    in_discarded = overlap_any(discarded_block_bboxes, 0.4)
+    in_image = overlap_any(image_bboxes, 0.5)
+    in_table = overlap_any(table_bboxes, 0.5)
+    in_other = overlap_any(other_block_bboxes, 0.5)
+
     new_spans = []
 
-    for span in spans:
-        span_bbox = span['bbox']
+    for index, span in enumerate(spans):
         span_type = span['type']
 
-        if any(calculate_overlap_area_in_bbox1_area_ratio(span_bbox, block_bbox) > 0.4 for block_bbox in
-               discarded_block_bboxes):
+        if in_discarded[index]:
             new_spans.append(span)
             continue
 
         if span_type == ContentType.IMAGE:
-            if any(calculate_overlap_area_in_bbox1_area_ratio(span_bbox, block_bbox) > 0.5 for block_bbox in
-                   image_bboxes):
+            if in_image[index]:
                 new_spans.append(span)
         elif span_type == ContentType.TABLE:
-            if any(calculate_overlap_area_in_bbox1_area_ratio(span_bbox, block_bbox) > 0.5 for block_bbox in
-                   table_bboxes):
+            if in_table[index]:
                 new_spans.append(span)
         else:
-            if any(calculate_overlap_area_in_bbox1_area_ratio(span_bbox, block_bbox) > 0.5 for block_bbox in
-                   other_block_bboxes):
+            if in_other[index]:
                 new_spans.append(span)
 
     return new_spans
@@ -85,6 +95,10 @@ def remove_overlaps_low_confidence_spans(spans):
 
 def remove_overlaps_min_spans(spans):
     dropped_spans = []
+    # bbox到首个对应span的索引，替代每次命中时对spans的线性查找
+    span_by_bbox = {}
+    for span in spans:
+        span_by_bbox.setdefault(tuple(span['bbox']), span)
     #  删除重叠spans中较小的那些
     for span1 in spans:
         for span2 in spans:
@@ -95,7 +109,7 @@ def remove_overlaps_min_spans(spans):
                 else:
                     overlap_box = get_minbox_if_overlap_by_ratio(span1['bbox'], span2['bbox'], 0.65)
                     if overlap_box is not None:
-                        span_need_remove = next((span for span in spans if span['bbox'] == overlap_box), None)
+                        span_need_remove = span_by_bbox.get(tuple(overlap_box))
                         if span_need_remove is not None and span_need_remove not in dropped_spans:
                             dropped_spans.append(span_need_remove)
     if len(dropped_spans) > 0:
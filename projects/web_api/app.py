@@ -1,14 +1,20 @@
 import json
 import os
+import shutil
 from base64 import b64encode
 from glob import glob
 from io import StringIO
+import re
 import tempfile
+import threading
+import time
+import uuid
 from typing import Tuple, Union
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi import BackgroundTasks, FastAPI, HTTPException, UploadFile
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse
 from loguru import logger
 
 from magic_pdf.data.read_api import read_local_images, read_local_office
@@ -17,7 +23,8 @@ from magic_pdf.config.enums import SupportedPdfParseMethod
 from magic_pdf.data.data_reader_writer import DataWriter, FileBasedDataWriter
 from magic_pdf.data.data_reader_writer.s3 import S3DataReader, S3DataWriter
 from magic_pdf.data.dataset import ImageDataset, PymuDocDataset
-from magic_pdf.libs.config_reader import get_bucket_name, get_s3_config
+from magic_pdf.libs.clean_memory import clean_memory
+from magic_pdf.libs.config_reader import get_bucket_name, get_device, get_s3_config
 from magic_pdf.model.doc_analyze_by_custom_model import doc_analyze
 from magic_pdf.operators.models import InferenceResult
 from magic_pdf.operators.pipes import PipeResult
@@ -25,12 +32,31 @@ from fastapi import Form
 
 model_config.__use_inside_model__ = True
 
+# get_device reads magic-pdf.json, resolve it once instead of on every request
+device_mode = get_device()
+
 app = FastAPI()
+# Parse results (layout, middle json, base64 images) are large and highly
+# compressible, gzip them for clients that accept it
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# file_parse is a sync handler, FastAPI runs it in its threadpool so the event
+# loop (and the gunicorn worker heartbeat) stays responsive while parsing
+parse_lock = threading.Lock()
 
 pdf_extensions = [".pdf"]
 office_extensions = [".ppt", ".pptx", ".doc", ".docx"]
 image_extensions = [".png", ".jpg", ".jpeg"]
 
+# Parsed PDF info requested with return_info_url is written here, one
+# directory per request named by a random job id, and served by get_info_file
+info_file_root = os.getenv(
+    "MINERU_API_INFO_DIR", os.path.join(tempfile.gettempdir(), "mineru_api_info")
+)
+# Seconds a written info file stays downloadable, older job directories are
+# removed by remove_expired_info_files
+info_file_ttl = int(os.getenv("MINERU_API_INFO_TTL", 3600))
+
 class MemoryDataWriter(DataWriter):
     def __init__(self):
         self.buffer = StringIO()
@@ -136,15 +162,22 @@ def process_file(
     elif file_extension in office_extensions:
         # 需要使用office解析
         temp_dir = tempfile.mkdtemp()
-        with open(os.path.join(temp_dir, f"temp_file.{file_extension}"), "wb") as f:
-            f.write(file_bytes)
-        ds = read_local_office(temp_dir)[0]
+        try:
+            with open(os.path.join(temp_dir, f"temp_file.{file_extension}"), "wb") as f:
+                f.write(file_bytes)
+            ds = read_local_office(temp_dir)[0]
+        finally:
+            # The dataset holds the file content in memory, the temp dir is no longer needed
+            shutil.rmtree(temp_dir, ignore_errors=True)
     elif file_extension in image_extensions:
         # 需要使用ocr解析
         temp_dir = tempfile.mkdtemp()
-        with open(os.path.join(temp_dir, f"temp_file.{file_extension}"), "wb") as f:
-            f.write(file_bytes)
-        ds = read_local_images(temp_dir)[0]
+        try:
+            with open(os.path.join(temp_dir, f"temp_file.{file_extension}"), "wb") as f:
+                f.write(file_bytes)
+            ds = read_local_images(temp_dir)[0]
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
     infer_result: InferenceResult = None
     pipe_result: PipeResult = None
 
@@ -171,12 +204,27 @@ def encode_image(image_path: str) -> str:
         return b64encode(f.read()).decode()
 
 
+def remove_expired_info_files():
+    """Remove info file job directories written more than info_file_ttl ago."""
+    if not os.path.isdir(info_file_root):
+        return
+    expire_before = time.time() - info_file_ttl
+    for entry in os.scandir(info_file_root):
+        try:
+            if entry.is_dir() and entry.stat().st_mtime < expire_before:
+                # Several workers may sweep the same directory at once
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except FileNotFoundError:
+            continue
+
+
 @app.post(
     "/file_parse",
     tags=["projects"],
     summary="Parse files (supports local files and S3)",
 )
-async def file_parse(
+def file_parse(
+    background_tasks: BackgroundTasks,
     file: UploadFile = None,
     file_path: str = Form(None),
     parse_method: str = Form("auto"),
@@ -186,6 +234,7 @@ async def file_parse(
     return_info: bool = Form(False),
     return_content_list: bool = Form(False),
     return_images: bool = Form(False),
+    return_info_url: bool = Form(False),
 ):
     """
     Execute the process of converting PDF to JSON and MD, outputting MD and JSON files
@@ -201,17 +250,26 @@ async def file_parse(
         is_json_md_dump: Whether to write parsed data to .json and .md files. Default
             to False. Different stages of data will be written to different .json files
             (3 in total), md content will be saved to .md file
-        output_dir: Output directory for results. A folder named after the PDF file
-            will be created to store all results
+        output_dir: Output directory for results. A per-request folder containing a
+            folder named after the PDF file will be created to store all results
         return_layout: Whether to return parsed PDF layout. Default to False
         return_info: Whether to return parsed PDF info. Default to False
         return_content_list: Whether to return parsed PDF content list. Default to False
+        return_info_url: Whether to write parsed PDF info to a per-request file and
+            return its url (`info_url`) instead of the content. The file can be
+            downloaded for `MINERU_API_INFO_TTL` seconds (default 3600), expired
+            files are removed after later requests that set this option. Default
+            to False
     """
+    # Release GPU cache and run gc after the response has been sent, so the
+    # client does not wait for the device sync
+    background_tasks.add_task(clean_memory, device_mode)
+
     try:
         if (file is None and file_path is None) or (
             file is not None and file_path is not None
         ):
-            return JSONResponse(
+            return ORJSONResponse(
                 content={"error": "Must provide either file or file_path"},
                 status_code=400,
             )
@@ -220,7 +278,10 @@ async def file_parse(
         file_name = os.path.basename(file_path if file_path else file.filename).split(
             "."
         )[0]
-        output_path = f"{output_dir}/{file_name}"
+        # Requests run concurrently, a per-request id keeps uploads with the
+        # same file name from writing into (and globbing) each other's images
+        request_id = uuid.uuid4().hex
+        output_path = f"{output_dir}/{request_id}/{file_name}"
         output_image_path = f"{output_path}/images"
 
         # Initialize readers/writers and get PDF content
@@ -231,8 +292,10 @@ async def file_parse(
             output_image_path=output_image_path,
         )
 
-        # Process PDF
-        infer_result, pipe_result = process_file(file_bytes, file_extension, parse_method, image_writer)
+        # Process PDF, the models in this worker are shared and used by one
+        # request at a time
+        with parse_lock:
+            infer_result, pipe_result = process_file(file_bytes, file_extension, parse_method, image_writer)
 
         # Use MemoryDataWriter to get results
         content_list_writer = MemoryDataWriter()
@@ -245,9 +308,7 @@ async def file_parse(
         pipe_result.dump_middle_json(middle_json_writer, "")
 
         # Get content
-        content_list = json.loads(content_list_writer.get_value())
         md_content = md_content_writer.get_value()
-        middle_json = json.loads(middle_json_writer.get_value())
         model_json = infer_result.get_infer_res()
 
         # If results need to be saved
@@ -271,14 +332,27 @@ async def file_parse(
             )
             infer_result.draw_model(os.path.join(output_path, f"{file_name}_model.pdf"))
 
+        info_job_id = None
+        if return_info_url:
+            # Write the already serialized middle json once into a directory of
+            # its own, the client fetches it from get_info_file instead of the
+            # response body
+            info_job_id = uuid.uuid4().hex
+            background_tasks.add_task(remove_expired_info_files)
+            FileBasedDataWriter(os.path.join(info_file_root, info_job_id)).write_string(
+                "middle.json", middle_json_writer.get_value()
+            )
+
         # Build return data
         data = {}
         if return_layout:
             data["layout"] = model_json
         if return_info:
-            data["info"] = middle_json
+            data["info"] = json.loads(middle_json_writer.get_value())
+        if info_job_id is not None:
+            data["info_url"] = f"/output/{info_job_id}/middle.json"
         if return_content_list:
-            data["content_list"] = content_list
+            data["content_list"] = json.loads(content_list_writer.get_value())
         if return_images:
             image_paths = glob(f"{output_image_path}/*.jpg")
             data["images"] = {
@@ -294,11 +368,36 @@ async def file_parse(
         md_content_writer.close()
         middle_json_writer.close()
 
-        return JSONResponse(data, status_code=200)
+        return ORJSONResponse(data, status_code=200)
 
     except Exception as e:
         logger.exception(e)
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+        return ORJSONResponse(content={"error": str(e)}, status_code=500)
+
+
+@app.get(
+    "/output/{job_id}/middle.json",
+    tags=["projects"],
+    summary="Download parsed PDF info written by file_parse with return_info_url",
+)
+def get_info_file(job_id: str):
+    """
+    Download the parsed PDF info of a file_parse request made with return_info_url.
+
+    The file is kept for `MINERU_API_INFO_TTL` seconds (default 3600) after it was
+    written, afterwards this returns 404 and the file is removed.
+    """
+    # Only job ids generated by file_parse are accepted, never arbitrary paths
+    if re.fullmatch(r"[0-9a-f]{32}", job_id) is None:
+        raise HTTPException(status_code=404, detail="Not found")
+    info_path = os.path.join(info_file_root, job_id, "middle.json")
+    try:
+        expired = os.path.getmtime(info_path) < time.time() - info_file_ttl
+    except OSError:
+        expired = True
+    if expired:
+        raise HTTPException(status_code=404, detail="Not found")
+    return FileResponse(info_path, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,13 @@
+import os
+
+# Every worker process loads its own copy of the models and parses one
+# document at a time, so this is the number of concurrent parses. Size it to
+# the available GPU memory rather than the CPU count
+workers = int(os.getenv("MINERU_API_WORKERS", 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Parsing runs in the worker's threadpool, so this only limits how long the
+# event loop may stay unresponsive before the worker is restarted, not how
+# long a single parse may take
+timeout = int(os.getenv("MINERU_API_TIMEOUT", 600))
+graceful_timeout = 30
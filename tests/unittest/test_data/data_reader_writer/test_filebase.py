@@ -1,8 +1,8 @@
 import os
 import shutil
 
-from magic_pdf.data.data_reader_writer import (FileBasedDataReader,
-                                               FileBasedDataWriter)
+from mineru.data.data_reader_writer import (FileBasedDataReader,
+                                            FileBasedDataWriter)
 
 
 def test_filebased_reader_writer():
@@ -22,3 +22,19 @@ def test_filebased_reader_writer():
     writer.write(abs_fn, b'hello world')
     assert reader.read(abs_fn) == b'hello world'
     shutil.rmtree(unitest_dir)
+
+
+def test_filebased_writer_recreates_removed_dir():
+
+    unitest_dir = '/tmp/mineru/unittest/data/filebased_writer_removed_dir'
+    sub_dir = os.path.join(unitest_dir, 'sub')
+
+    writer = FileBasedDataWriter(unitest_dir)
+    reader = FileBasedDataReader(unitest_dir)
+
+    writer.write('sub/a.txt', b'hello')
+    shutil.rmtree(sub_dir)
+
+    writer.write('sub/b.txt', b'world')
+    assert reader.read('sub/b.txt') == b'world'
+    shutil.rmtree(unitest_dir)
@@ -0,0 +1,34 @@
+import random
+
+from mineru.utils.boxbase import (calculate_overlap_area_in_bbox1_area_ratio,
+                                  calculate_overlap_area_in_bbox1_area_ratio_matrix)
+
+
+def random_bbox(rng):
+    x0, y0 = rng.randint(0, 50), rng.randint(0, 50)
+    # 允许宽高为0或负数，覆盖退化和反向的box
+    return [x0, y0, x0 + rng.randint(-5, 20), y0 + rng.randint(-5, 20)]
+
+
+def test_overlap_ratio_matrix_matches_scalar():
+    rng = random.Random(0)
+    for _ in range(2000):
+        bboxes1 = [random_bbox(rng) for _ in range(rng.randint(1, 6))]
+        bboxes2 = [random_bbox(rng) for _ in range(rng.randint(1, 6))]
+
+        ratio_matrix = calculate_overlap_area_in_bbox1_area_ratio_matrix(bboxes1, bboxes2)
+
+        assert ratio_matrix.shape == (len(bboxes1), len(bboxes2))
+        for i, bbox1 in enumerate(bboxes1):
+            for j, bbox2 in enumerate(bboxes2):
+                assert ratio_matrix[i, j] == calculate_overlap_area_in_bbox1_area_ratio(bbox1, bbox2)
+
+
+def test_overlap_ratio_matrix_empty_inputs():
+    bboxes = [[0, 0, 10, 10], [5, 5, 20, 20]]
+
+    ratio_matrix = calculate_overlap_area_in_bbox1_area_ratio_matrix(bboxes, [])
+    assert ratio_matrix.shape == (2, 0)
+    assert not (ratio_matrix > 0.5).any(axis=1).any()
+
+    assert calculate_overlap_area_in_bbox1_area_ratio_matrix([], bboxes).shape == (0, 2)
@@ -0,0 +1,63 @@
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from mineru.utils import pdf_image_tools
+from mineru.utils.pdf_image_tools import load_images_from_pdf
+
+pdf_path = 'demo/pdfs/demo1.pdf'
+
+
+@pytest.fixture(scope='module')
+def pdf_bytes():
+    with open(pdf_path, 'rb') as f:
+        yield f.read()
+    if pdf_image_tools._render_pool is not None:
+        pdf_image_tools._render_pool.shutdown()
+        pdf_image_tools._render_pool = None
+
+
+def assert_same_images(images_list, expected_images_list):
+    assert len(images_list) == len(expected_images_list)
+    for image_dict, expected_image_dict in zip(images_list, expected_images_list):
+        assert image_dict['img_base64'] == expected_image_dict['img_base64']
+        assert image_dict['scale'] == expected_image_dict['scale']
+        assert image_dict['img_pil'].mode == expected_image_dict['img_pil'].mode
+        assert image_dict['img_pil'].size == expected_image_dict['img_pil'].size
+
+
+def test_render_pool_matches_sequential(pdf_bytes):
+    sequential_images, _ = load_images_from_pdf(pdf_bytes, processes=1)
+    pool_images, _ = load_images_from_pdf(pdf_bytes, processes=2)
+    assert_same_images(pool_images, sequential_images)
+
+    # 不同页数的调用复用同一个进程池
+    render_pool = pdf_image_tools._render_pool
+    assert render_pool is not None
+    pool_images, _ = load_images_from_pdf(pdf_bytes, start_page_id=1, end_page_id=9, processes=2)
+    assert pdf_image_tools._render_pool is render_pool
+    assert_same_images(pool_images, sequential_images[1:10])
+
+
+class BrokenRenderPool:
+    def __init__(self):
+        self.shutdown_called = False
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool('worker died')
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        assert not cancel_futures
+        self.shutdown_called = True
+
+
+def test_render_pool_broken_fallback(pdf_bytes, monkeypatch):
+    sequential_images, _ = load_images_from_pdf(pdf_bytes, processes=1)
+
+    broken_pool = BrokenRenderPool()
+    monkeypatch.setattr(pdf_image_tools, '_render_pool', broken_pool)
+
+    images_list, _ = load_images_from_pdf(pdf_bytes, processes=2)
+    assert_same_images(images_list, sequential_images)
+    assert broken_pool.shutdown_called
+    assert pdf_image_tools._render_pool is None